@@ -4,8 +4,10 @@ from typing import Union
 
 import pandas as pd
 
+DATABASE_PATH = Path("data/MundoEcommerce.parquet")
 
-def load_database(path: Union[str, Path] = "data/MundoEcommerce.parquet") -> pd.DataFrame:
+
+def load_database(path: Union[str, Path] = DATABASE_PATH) -> pd.DataFrame:
     """Load the MundoEcommerce parquet dataset.
 
     Parameters
@@ -1,13 +1,48 @@
 # main.py
-from typing import List, Dict, Any, Optional
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union
 
+import matplotlib.pyplot as plt
 import pandas as pd
 
 from exploratoria import (
     grafico_distribuicao, grafico_categorico,
     grafico_boxplot, grafico_kde, grafico_missing, grafico_correlacao
 )
-from function import load_database
+from function import DATABASE_PATH, load_database
+
+RENDER_DIR = Path("data/renders")
+RENDER_MANIFEST = "_manifest.json"
+
+# Code that determines how a chart looks; changing it invalidates rendered PNGs
+_CHART_CODE = (Path(__file__).with_name("exploratoria.py"), Path(__file__))
+
+NUMERIC_PLOT_TYPES = ("Histograma", "Boxplot", "KDE")
+
+# pyplot's figure manager is not thread-safe (warm-up thread x Streamlit sessions)
+_RENDER_LOCK = threading.Lock()
+
+# Slugs used to build stable file names for rendered charts
+_PLOT_SLUGS = {
+    "Histograma": "histograma",
+    "Boxplot": "boxplot",
+    "KDE": "kde",
+    "Barras": "barras",
+    "Ausentes": "ausentes",
+    "Correlação": "correlacao",
+}
+
+ChartSpec = Tuple[str, Optional[str]]
 
 
 def load_data(path: Optional[str] = None) -> pd.DataFrame:
@@ -18,11 +53,11 @@ def load_data(path: Optional[str] = None) -> pd.DataFrame:
 
 
 def numeric_columns(df: pd.DataFrame) -> List[str]:
-    return df.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    return df.select_dtypes(include=["number"]).columns.tolist()
 
 
 def categorical_columns(df: pd.DataFrame) -> List[str]:
-    return df.select_dtypes(include=["object"]).columns.tolist()
+    return df.select_dtypes(include=["object", "category"]).columns.tolist()
 
 
 def numeric_stats(df: pd.DataFrame, col: str) -> Dict[str, Any]:
@@ -33,10 +68,15 @@ def numeric_stats(df: pd.DataFrame, col: str) -> Dict[str, Any]:
         "max": float(desc.get("max", float("nan"))),
         "mean": float(desc.get("mean", float("nan"))),
         "median": float(s.median()) if not s.empty else None,
+        "std": float(desc.get("std", float("nan"))),
         "count": int(desc.get("count", 0)),
     }
 
 
+def all_numeric_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    return {col: numeric_stats(df, col) for col in numeric_columns(df)}
+
+
 def figure_for_numeric(df: pd.DataFrame, col: str, plot_type: str):
     """Return a matplotlib Figure for a numeric column and plot type."""
     if plot_type == "Histograma":
@@ -60,9 +100,190 @@ def figure_correlation(df: pd.DataFrame):
     return grafico_correlacao(df)
 
 
+def figure_for_chart(df: pd.DataFrame, plot_type: str, col: Optional[str] = None, top_n: int = 10):
+    """Return the Figure for a chart spec (plot type + optional column)."""
+    if plot_type in NUMERIC_PLOT_TYPES:
+        return figure_for_numeric(df, col, plot_type)
+    if plot_type == "Barras":
+        return figure_for_categorical(df, col, top_n=top_n)
+    if plot_type == "Ausentes":
+        return figure_missing(df)
+    if plot_type == "Correlação":
+        return figure_correlation(df)
+    raise ValueError(f"Unknown plot type: {plot_type}")
+
+
+def chart_specs(df: pd.DataFrame) -> List[ChartSpec]:
+    """List every chart the app can show for the dataset, as (plot type, column) pairs."""
+    specs: List[ChartSpec] = []
+    if df.isna().any().any():
+        specs.append(("Ausentes", None))
+    if len(numeric_columns(df)) >= 2:
+        specs.append(("Correlação", None))
+    for col in numeric_columns(df):
+        specs.extend((plot_type, col) for plot_type in NUMERIC_PLOT_TYPES)
+    for col in categorical_columns(df):
+        specs.append(("Barras", col))
+    return specs
+
+
+def chart_filename(plot_type: str, col: Optional[str] = None, top_n: int = 10) -> str:
+    """Stable PNG file name for a chart; also used as its key in the render cache."""
+    slug = _PLOT_SLUGS[plot_type]
+    if plot_type == "Barras":
+        slug = f"{slug}_top{top_n}"
+    if col is None:
+        return f"{slug}.png"
+    col_slug = re.sub(r"\W+", "_", col).strip("_").lower()
+    return f"{col_slug}__{slug}.png"
+
+
+def render_chart_png(df: pd.DataFrame, plot_type: str, col: Optional[str] = None, top_n: int = 10) -> bytes:
+    """Render a chart to PNG bytes and release the Figure."""
+    with _RENDER_LOCK:
+        fig = figure_for_chart(df, plot_type, col, top_n=top_n)
+        try:
+            buf = BytesIO()
+            # Same options st.pyplot uses, so cached images look like live ones
+            fig.savefig(buf, format="png", bbox_inches="tight", dpi=200)
+            return buf.getvalue()
+        finally:
+            plt.close(fig)
+
+
+@lru_cache(maxsize=1)
+def _chart_code_version() -> str:
+    digest = hashlib.sha256()
+    for code in _CHART_CODE:
+        digest.update(code.read_bytes())
+    return digest.hexdigest()
+
+
+def render_cache_key(path: Optional[str] = None) -> str:
+    """Identify the rendered charts of a dataset: its path, its mtime and the chart code version."""
+    source = Path(path) if path else DATABASE_PATH
+    return f"{source.resolve()}|{source.stat().st_mtime_ns}|{_chart_code_version()}"
+
+
+def read_cached_chart(plot_type: str, col: Optional[str] = None, top_n: int = 10,
+                      path: Optional[str] = None, render_dir: Union[str, Path] = RENDER_DIR) -> Optional[bytes]:
+    """Return a PNG rendered by ``render_all_charts`` for this dataset and code, or None."""
+    render_dir = Path(render_dir)
+    try:
+        manifest = json.loads((render_dir / RENDER_MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("key") != render_cache_key(path):
+            return None
+        return (render_dir / chart_filename(plot_type, col, top_n=top_n)).read_bytes()
+    except (OSError, ValueError):
+        return None
+
+
+# Per-process dataset for the render pool (loaded once by the initializer)
+_WORKER_DF: Optional[pd.DataFrame] = None
+
+
+def _init_render_worker(path: Optional[str]):
+    global _WORKER_DF
+    plt.switch_backend("Agg")
+    _WORKER_DF = load_data(path)
+
+
+def _render_to_file(spec: ChartSpec, out_dir: Path, top_n: int) -> Path:
+    plot_type, col = spec
+    target = out_dir / chart_filename(plot_type, col, top_n=top_n)
+    tmp = target.with_suffix(".png.tmp")
+    try:
+        tmp.write_bytes(render_chart_png(_WORKER_DF, plot_type, col, top_n=top_n))
+        # Atomic rename: readers of the render cache never see half-written files
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+
+def render_all_charts(out_dir: Union[str, Path] = RENDER_DIR,
+                      path: Optional[str] = None,
+                      workers: Optional[int] = None,
+                      top_n: int = 10,
+                      on_progress: Optional[Callable[[int, int, Path, Optional[str]], None]] = None,
+                      ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """Render every chart of the dataset to PNG files in parallel across processes.
+
+    Each worker loads the dataset once; charts are then distributed among the workers.
+    ``on_progress(done, total, file, error)`` is called in the parent as each chart
+    finishes (``error`` is None on success). A failing chart does not stop the others;
+    returns the rendered files and the ``(file, error)`` failures.
+
+    The manifest with the cache key is written last, so ``read_cached_chart`` only serves
+    a directory whose run finished for the same dataset and chart code. It is written even
+    if some charts failed: their files are removed, so the app renders those live.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = out_dir / RENDER_MANIFEST
+    manifest.unlink(missing_ok=True)
+    key = render_cache_key(path)
+    specs = chart_specs(load_data(path))
+    rendered: List[Path] = []
+    failures: List[Tuple[Path, str]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker, initargs=(path,)) as pool:
+        futures = {pool.submit(_render_to_file, spec, out_dir, top_n): spec for spec in specs}
+        for future in as_completed(futures):
+            plot_type, col = futures[future]
+            target = out_dir / chart_filename(plot_type, col, top_n=top_n)
+            error = None
+            try:
+                future.result()
+                rendered.append(target)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                # Um PNG antigo não pode ser servido com a chave nova
+                target.unlink(missing_ok=True)
+                failures.append((target, error))
+            if on_progress:
+                on_progress(len(rendered) + len(failures), len(specs), target, error)
+    tmp = manifest.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"key": key}), encoding="utf-8")
+    os.replace(tmp, manifest)
+    return sorted(rendered), sorted(failures)
+
+
+def print_render_progress(done: int, total: int, target: Path, error: Optional[str]):
+    print(f"[{done}/{total}] {target}" + (f" — ERRO: {error}" if error else ""))
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"deve ser >= 1 (recebido: {value})")
+    return number
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Resumo da base ou renderização headless dos gráficos.")
+    parser.add_argument("--data", default=None, help="Caminho do parquet (padrão: base do projeto).")
+    parser.add_argument("--render", nargs="?", const=str(RENDER_DIR), default=None, metavar="DIR",
+                        help=f"Renderiza todos os gráficos em DIR (padrão: {RENDER_DIR}).")
+    parser.add_argument("--workers", type=_positive_int, default=None, help="Processos paralelos (padrão: nº de CPUs).")
+    parser.add_argument("--top-n", type=_positive_int, default=10, help="Categorias exibidas nos gráficos de barras.")
+    return parser.parse_args(argv)
+
+
 # If the module is executed directly, provide a small demo loader (non-UI)
 if __name__ == "__main__":
-    df = load_data()
-    print("Loaded dataset with shape:", df.shape)
-    print("Numeric columns:", numeric_columns(df))
-    print("Categorical columns:", categorical_columns(df))
+    args = _parse_args()
+    if args.render:
+        plt.switch_backend("Agg")
+        files, failures = render_all_charts(
+            args.render, path=args.data, workers=args.workers, top_n=args.top_n,
+            on_progress=print_render_progress,
+        )
+        print(f"{len(files)} gráficos gerados em {args.render}/")
+        if failures:
+            print(f"{len(failures)} gráficos falharam.")
+            sys.exit(1)
+    else:
+        df = load_data(args.data)
+        print("Loaded dataset with shape:", df.shape)
+        print("Numeric columns:", numeric_columns(df))
+        print("Categorical columns:", categorical_columns(df))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
 from typing import Dict
 
@@ -9,6 +11,9 @@ from function import load_database
 
 WAREHOUSE_DIR = Path("data/warehouse")
 
+# Serializa a geração do modelo (warm-up em background x sessões do Streamlit)
+_BUILD_LOCK = threading.Lock()
+
 
 def _prep_dates(df: pd.DataFrame, col: str) -> pd.Series:
     if col not in df.columns:
@@ -135,8 +140,13 @@ def build_star_schema(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
 
 def save_star_schema(tables: Dict[str, pd.DataFrame], out_dir: Path = WAREHOUSE_DIR):
     out_dir.mkdir(parents=True, exist_ok=True)
-    for name, table in tables.items():
-        table.to_parquet(out_dir / f"{name}.parquet", index=False)
+    # fact_sales por último: sua presença indica que o modelo foi gravado por completo
+    for name, table in sorted(tables.items(), key=lambda item: item[0] == "fact_sales"):
+        target = out_dir / f"{name}.parquet"
+        tmp = target.with_suffix(".parquet.tmp")
+        table.to_parquet(tmp, index=False)
+        # Rename atômico: leitores nunca veem um arquivo pela metade
+        os.replace(tmp, target)
 
 
 def load_star_schema(out_dir: Path = WAREHOUSE_DIR, build_if_missing: bool = True) -> Dict[str, pd.DataFrame]:
@@ -144,12 +154,18 @@ def load_star_schema(out_dir: Path = WAREHOUSE_DIR, build_if_missing: bool = Tru
         "dim_date.parquet", "dim_customer.parquet", "dim_product.parquet", "dim_geography.parquet",
         "dim_ship_mode.parquet", "dim_order_priority.parquet", "fact_sales.parquet"
     ]
-    if not out_dir.exists() or any(not (out_dir / f).exists() for f in expected):
+
+    def missing() -> bool:
+        return not out_dir.exists() or any(not (out_dir / f).exists() for f in expected)
+
+    if missing():
         if not build_if_missing:
             raise FileNotFoundError("Arquivos do modelo dimensional não encontrados.")
-        base = load_database()
-        star = build_star_schema(base)
-        save_star_schema(star, out_dir)
+        with _BUILD_LOCK:
+            if missing():
+                base = load_database()
+                star = build_star_schema(base)
+                save_star_schema(star, out_dir)
     loaded: Dict[str, pd.DataFrame] = {}
     for f in expected:
         name = f.replace('.parquet', '')
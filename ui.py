@@ -1,16 +1,10 @@
 # ui.py
 import streamlit as st
 
-from exploratoria import (
-    grafico_distribuicao,
-    grafico_categorico,
-    grafico_boxplot,
-    grafico_kde,
-    grafico_missing,
-    grafico_correlacao,
-)
 from function import load_database
+from main import all_numeric_stats, categorical_columns, numeric_columns, numeric_stats, render_cache_key
 from ui_helpers import select_with_tooltip
+from warmup import WarmupService
 
 # Try to import dimensional model utilities
 try:
@@ -18,11 +12,50 @@ try:
 except Exception:  # pragma: no cover
     load_star_schema = None  # type: ignore
 
+TOP_N = 10
+
 # Configuração da página
 st.set_page_config(page_title="Mundo Ecommerce - Análise", layout="wide")
 
 st.title("📊 Análise Exploratória - MundoEcommerce")
 
+
+@st.cache_resource(max_entries=1)
+def warmup_service(cache_key: str) -> WarmupService:
+    """Start the background warm-up once per server process (i.e. with its first session).
+
+    ``cache_key`` (dataset path + mtime + chart code version) makes Streamlit start a new
+    service, with fresh data, stats and charts, when the dataset or the chart code changes.
+    """
+    return WarmupService(top_n=TOP_N).start()
+
+
+warmup = warmup_service(render_cache_key())
+
+
+def warmup_status(live: bool):
+    progress = warmup.progress()
+    if not progress.finished:
+        st.progress(progress.fraction,
+                    text=f"Preparando cache: {progress.step or '...'} ({progress.done}/{progress.total})")
+    elif live:
+        # Terminou: uma execução completa para o fragmento parar de se atualizar
+        st.rerun()
+    for error in progress.errors:
+        st.warning(f"Falha no aquecimento do cache — {error}")
+
+
+# Atualiza sozinho enquanto o aquecimento roda (st.sidebar não pode ser chamado dentro do fragmento)
+warmup_running = not warmup.progress().finished
+with st.sidebar:
+    st.fragment(warmup_status, run_every="1s" if warmup_running else None)(warmup_running)
+
+
+def show_chart(plot_type, col=None):
+    """Show a chart from the warm-up / render cache, rendering (and caching) it if needed."""
+    st.image(warmup.chart(df, plot_type, col), width="stretch")
+
+
 # Sidebar: seleção do modo de dados
 mode = st.sidebar.radio(
     "Fonte de Dados",
@@ -31,7 +64,7 @@ mode = st.sidebar.radio(
 )
 
 # Carregar base bruta sempre (usa em ambos os modos para descrições)
-df_raw = load_database()
+df_raw = warmup.get("base", load_database)
 
 # Mapeamento de descrições em Português para exibir na UI
 column_descriptions_pt = {
@@ -64,7 +97,7 @@ if mode == "Modelo Dimensional":
         st.error("Função load_star_schema indisponível. Verifique modelagem.py.")
         st.stop()
     with st.spinner("Carregando modelo dimensional (ou gerando se ausente)..."):
-        star = load_star_schema()
+        star = warmup.get("star", load_star_schema)
     fact = star["fact_sales"]
 
     # Mostrar overview das tabelas
@@ -150,26 +183,22 @@ st.dataframe(df.head())
 
 # Estatísticas
 st.subheader("Informações Estatísticas")
-st.write(df.describe(include="all"))
+st.write(warmup.get("describe", lambda: df.describe(include="all")))
 
 # Tipos de colunas
-num_cols = df.select_dtypes(include=["number"]).columns.tolist()
-cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+num_cols = numeric_columns(df)
+cat_cols = categorical_columns(df)
 
 # Mostrar valores ausentes (se existirem)
 missing_total = df.isna().sum()
 if (missing_total > 0).any():
     st.subheader("Valores Ausentes por Coluna")
-    fig_miss = grafico_missing(df)
-    st.pyplot(fig_miss)
+    show_chart("Ausentes")
 
 # Correlação (se houver pelo menos 2 numéricas)
 if len(num_cols) >= 2:
     st.subheader("Correlação entre Variáveis Numéricas")
-    fig_corr = grafico_correlacao(df)
-    st.pyplot(fig_corr)
-
-TOP_N = 10
+    show_chart("Correlação")
 
 # Distribuição numérica
 if num_cols:
@@ -180,20 +209,21 @@ if num_cols:
         key="sel_num_col",
         get_description=lambda c: column_descriptions_pt.get(c, None),
     )
-    stats = df[num_col].describe()
+    stats = warmup.get("stats", lambda: all_numeric_stats(df)).get(num_col) or numeric_stats(df, num_col)
+    median = stats['median'] if stats['median'] is not None else float("nan")
     st.write(
-        f"Mínimo: {stats['min']:.2f} | Máximo: {stats['max']:.2f} | Média: {stats['mean']:.2f} | Mediana: {df[num_col].median():.2f} | Std: {stats['std']:.2f}"
+        f"Mínimo: {stats['min']:.2f} | Máximo: {stats['max']:.2f} | Média: {stats['mean']:.2f} | Mediana: {median:.2f} | Std: {stats['std']:.2f}"
     )
     col_a, col_b, col_c = st.columns(3)
     with col_a:
         st.caption("Histograma + KDE")
-        st.pyplot(grafico_distribuicao(df, num_col))
+        show_chart("Histograma", num_col)
     with col_b:
         st.caption("Boxplot")
-        st.pyplot(grafico_boxplot(df, num_col))
+        show_chart("Boxplot", num_col)
     with col_c:
         st.caption("Densidade (KDE)")
-        st.pyplot(grafico_kde(df, num_col))
+        show_chart("KDE", num_col)
 else:
     st.info("Nenhuma coluna numérica detectada na base.")
 
@@ -211,7 +241,7 @@ if cat_cols:
     nunique = int(df[cat_col].nunique())
     mode_val = df[cat_col].mode(dropna=True)[0] if not df[cat_col].dropna().empty else None
     st.write(f"Categorias únicas: {nunique} | Mais frequente: {mode_val}")
-    st.pyplot(grafico_categorico(df, cat_col, top_n=TOP_N))
+    show_chart("Barras", cat_col)
 else:
     st.info("Nenhuma coluna categórica detectada na base.")
 
@@ -0,0 +1,182 @@
+"""Background warm-up of the app caches.
+
+Streamlit has no server start hook, so ``ui.py`` starts the warm-up with the first session
+of each server process. Items the sessions ask for before the warm-up reaches them are
+computed by the session and skipped by the warm-up, so nothing is computed twice.
+
+To prefill the on-disk caches before starting the app (e.g. in a deploy step), run:
+
+    python warmup.py
+
+It builds the dimensional model in ``data/warehouse/`` and renders every chart into
+``data/renders/``. The statistics only live in memory and are not kept by this command.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from main import (
+    RENDER_DIR, load_data, numeric_columns, categorical_columns, all_numeric_stats,
+    chart_specs, chart_filename, read_cached_chart, render_chart_png, render_all_charts,
+)
+from modelagem import load_star_schema
+
+Step = Tuple[str, str, Callable[[], Any]]
+
+
+@dataclass
+class WarmupProgress:
+    done: int = 0
+    total: int = 0
+    step: str = ""
+    finished: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+
+class WarmupService:
+    """Precomputes the warehouse, column statistics and default charts in a background thread.
+
+    Results are read with :meth:`get`. An item being computed (by the warm-up or another
+    session) is waited for; an item nobody computed yet is computed by the caller and
+    then skipped by the warm-up. ``on_progress`` is called (from the warm-up thread)
+    after each step.
+    """
+
+    def __init__(self, data_path: Optional[str] = None, render_dir: Path = RENDER_DIR, top_n: int = 10,
+                 on_progress: Optional[Callable[[WarmupProgress], None]] = None):
+        self._data_path = data_path
+        self._render_dir = Path(render_dir)
+        self._top_n = top_n
+        self._on_progress = on_progress
+        self._cond = threading.Condition()
+        self._results: Dict[str, Any] = {}
+        self._running: Set[str] = set()
+        self._progress = WarmupProgress()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "WarmupService":
+        """Start the warm-up in a daemon thread (no-op if already started)."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def progress(self) -> WarmupProgress:
+        with self._cond:
+            return replace(self._progress, errors=list(self._progress.errors))
+
+    def get(self, key: str, fallback: Optional[Callable[[], Any]] = None) -> Any:
+        """Return the result for ``key``, computing it with ``fallback`` if nobody did yet.
+
+        Without a fallback, returns ``None`` when the result is not available.
+        """
+        with self._cond:
+            while key in self._running:
+                self._cond.wait()
+            if key in self._results or fallback is None:
+                return self._results.get(key)
+            self._running.add(key)
+        value = None
+        try:
+            value = fallback()
+            return value
+        finally:
+            self._finish(key, value)
+
+    def chart(self, df: pd.DataFrame, plot_type: str, col: Optional[str] = None) -> bytes:
+        """PNG of a chart: warmed, rendered by ``python main.py --render`` or rendered now."""
+        return self.get(chart_filename(plot_type, col, top_n=self._top_n),
+                        lambda: self._render_chart(df, plot_type, col))
+
+    def run(self):
+        """Run every warm-up step in the calling thread."""
+        with self._cond:
+            self._progress.total = 1
+        try:
+            df = self._run_step("base", "Base de dados", lambda: load_data(self._data_path))
+            if df is None:
+                return
+            steps = self._plan(df)
+            with self._cond:
+                self._progress.total += len(steps)
+            for key, label, func in steps:
+                self._run_step(key, label, func)
+        finally:
+            with self._cond:
+                self._progress.step = ""
+                self._progress.finished = True
+                self._cond.notify_all()
+
+    def _plan(self, df: pd.DataFrame) -> List[Step]:
+        # Telas padrão primeiro (modo "Dados Brutos"), depois o modelo dimensional
+        steps: List[Step] = [
+            ("describe", "Estatísticas gerais", lambda: df.describe(include="all")),
+            ("stats", "Estatísticas por coluna", lambda: all_numeric_stats(df)),
+        ]
+        # Gráficos exibidos ao abrir a página: os gerais e os da primeira coluna de cada tipo
+        default_cols = {None, *numeric_columns(df)[:1], *categorical_columns(df)[:1]}
+        for plot_type, col in chart_specs(df):
+            if col not in default_cols:
+                continue
+            label = f"Gráfico {plot_type}" + (f" de {col}" if col else "")
+            steps.append((chart_filename(plot_type, col, top_n=self._top_n), label,
+                          lambda p=plot_type, c=col: self._render_chart(df, p, c)))
+        steps.append(("star", "Modelo dimensional", load_star_schema))
+        return steps
+
+    def _render_chart(self, df: pd.DataFrame, plot_type: str, col: Optional[str]) -> bytes:
+        cached = read_cached_chart(plot_type, col, top_n=self._top_n, path=self._data_path,
+                                   render_dir=self._render_dir)
+        if cached is not None:
+            return cached
+        return render_chart_png(df, plot_type, col, top_n=self._top_n)
+
+    def _run_step(self, key: str, label: str, func: Callable[[], Any]) -> Any:
+        with self._cond:
+            self._progress.step = label
+        value = None
+        try:
+            # Via get(): reaproveita o que uma sessão já calculou (ou está calculando)
+            value = self.get(key, func)
+        except Exception as e:
+            with self._cond:
+                self._progress.errors.append(f"{label}: {e}")
+        with self._cond:
+            self._progress.done += 1
+        if self._on_progress:
+            self._on_progress(self.progress())
+        return value
+
+    def _finish(self, key: str, value: Any):
+        with self._cond:
+            if value is not None:
+                self._results[key] = value
+            self._running.discard(key)
+            self._cond.notify_all()
+
+
+if __name__ == "__main__":
+    import sys
+
+    import matplotlib.pyplot as plt
+
+    from main import print_render_progress
+
+    plt.switch_backend("Agg")
+    print("Modelo dimensional...")
+    load_star_schema()
+    files, failures = render_all_charts(RENDER_DIR, on_progress=print_render_progress)
+    print(f"Warm-up concluído: modelo em data/warehouse/, {len(files)} gráficos em {RENDER_DIR}/")
+    if failures:
+        print(f"{len(failures)} gráficos falharam.")
+        sys.exit(1)